@@ -2,7 +2,8 @@
 LifeOps AI v2 - Fixed Agents file
 """
 import os
-from typing import List
+from functools import lru_cache
+from typing import Dict, List, Optional
 from crewai import Agent
 from crewai.tools import tool 
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -31,56 +32,69 @@ def validate_cross_domain(domain: str, recommendation: str, context: dict):
 
 # --- AGENTS CLASS ---
 
+@lru_cache(maxsize=4)
+def _gemini_llm(api_key: Optional[str]) -> ChatGoogleGenerativeAI:
+    """One Gemini client per API key; it keeps no per-user state, so sessions can share it"""
+    # Use gemini-pro or gemini-1.5-flash
+    return ChatGoogleGenerativeAI(
+        model="gemini-pro",
+        temperature=0.7,
+        google_api_key=api_key
+    )
+
 class LifeOpsAgents:
     def __init__(self):
-        # Use gemini-pro or gemini-1.5-flash
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-pro",
-            temperature=0.7,
-            google_api_key=os.getenv("GOOGLE_API_KEY")
-        )
+        self.llm = _gemini_llm(os.getenv("GOOGLE_API_KEY"))
+        self._agents: Dict[str, Agent] = {}
+
+    def _agent(self, key: str, **config) -> Agent:
+        """Build an agent once per instance and hand back the same one afterwards"""
+        agent = self._agents.get(key)
+        if agent is None:
+            agent = self._agents[key] = Agent(llm=self.llm, **config)
+        return agent
 
     def create_health_agent(self) -> Agent:
-        return Agent(
+        return self._agent(
+            "health",
             role="Health and Wellness Expert",
             goal="Optimize health and wellness through personalized recommendations",
             backstory="Dr. Maya Patel, with 15 years in integrative medicine, specializes in stress management and preventive healthcare.",
             verbose=True,
             allow_delegation=False,
-            llm=self.llm,
             tools=[schedule_action_item, set_reminder]
         )
     
     def create_finance_agent(self) -> Agent:
-        return Agent(
+        return self._agent(
+            "finance",
             role="Personal Finance Advisor",
             goal="Manage finances efficiently and build wealth",
             backstory="Alex Chen, a CFA with expertise in personal finance and behavioral economics.",
             verbose=True,
             allow_delegation=False,
-            llm=self.llm,
             tools=[schedule_action_item]
         )
     
     def create_study_agent(self) -> Agent:
-        return Agent(
+        return self._agent(
+            "study",
             role="Learning Specialist",
             goal="Optimize study patterns and academic performance",
             backstory="Prof. James Wilson, cognitive scientist specializing in learning optimization and productivity.",
             verbose=True,
             allow_delegation=False,
-            llm=self.llm,
             tools=[schedule_action_item, set_reminder]
         )
     
     def create_life_coordinator(self) -> Agent:
-        return Agent(
+        return self._agent(
+            "coordinator",
             role="Life Coordinator",
             goal="Orchestrate life domains for optimal balance and productivity",
             backstory="Sophia Williams, systems thinker and life architect with expertise in multi-domain optimization.",
             verbose=True,
             allow_delegation=True,
-            llm=self.llm,
             tools=[validate_cross_domain, schedule_action_item]
         )
 
@@ -2,6 +2,7 @@
 LifeOps AI v2 - Multi-User Streamlit Application with Professional UI
 """
 import streamlit as st
+import atexit
 import os
 import sys
 from datetime import datetime, timedelta
@@ -21,7 +22,14 @@ from crew_setup import LifeOpsCrew
 from database import LifeOpsDatabase
 
 # Initialize database
-db = LifeOpsDatabase()
+@st.cache_resource
+def get_db() -> LifeOpsDatabase:
+    """One database per server process, shared by every session and rerun"""
+    database = LifeOpsDatabase()
+    atexit.register(database.close)
+    return database
+
+db = get_db()
 
 # Force OpenAI to be disabled globally
 os.environ["OPENAI_API_KEY"] = "not-required"
@@ -65,24 +73,6 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-
-st.markdown("""
-<style>
-
-    header {
-        visibility: visible !important; 
-    }
-    
-
-    [data-testid="collapsedControl"] {
-        display: block !important;
-        visibility: visible !important;
-        color: black !important;
-        z-index: 100000;
-    }
-</style>
-""", unsafe_allow_html=True)
-
 def initialize_session_state():
     """Initialize session state variables for multi-user"""
     # Authentication state
@@ -109,12 +99,12 @@ def initialize_session_state():
     
     # User-specific data (loaded after auth)
     if st.session_state.authenticated and st.session_state.user_id:
-        if 'todo_items' not in st.session_state:
-            st.session_state.todo_items = db.get_pending_actions(st.session_state.user_id)
-        if 'medicines' not in st.session_state:
-            st.session_state.medicines = db.get_todays_medicines(st.session_state.user_id)
-        if 'bills' not in st.session_state:
-            st.session_state.bills = db.get_monthly_bills(st.session_state.user_id)
+        if any(key not in st.session_state for key in ('todo_items', 'medicines', 'bills')):
+            # One connection for all dashboard lists instead of three
+            dashboard = db.get_dashboard(st.session_state.user_id)
+            st.session_state.todo_items = dashboard['pending']
+            st.session_state.medicines = dashboard['meds']
+            st.session_state.bills = dashboard['bills']
         if 'notes' not in st.session_state:
             st.session_state.notes = db.get_notes(st.session_state.user_id)
     else:
@@ -375,7 +365,9 @@ def dashboard_page():
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
             if st.button("🚀 Run AI Life Analysis", type="primary", use_container_width=True):
-                run_ai_analysis(st.session_state.user_inputs)
+                # Pressing again with results on screen asks for a fresh answer
+                run_ai_analysis(st.session_state.user_inputs,
+                                use_cache=st.session_state.analysis_results is None)
     
     # Metrics Cards
     st.markdown("### 📈 Key Metrics")
@@ -416,7 +408,7 @@ def dashboard_page():
     with col4:
         try:
             consistency_streak = db.get_consistency_streak(st.session_state.user_id)
-        except:
+        except Exception:
             consistency_streak = 0
         st.markdown(f"""
         <div class="metric-card">
@@ -520,7 +512,7 @@ def health_vault_page():
         st.markdown("#### 📋 Current Medicines")
         try:
             medicines = db.get_all_medicines(st.session_state.user_id)
-        except:
+        except Exception:
             medicines = []
         
         if medicines:
@@ -608,7 +600,7 @@ def finance_hub_page():
         st.markdown("#### 📅 Upcoming Bills")
         try:
             bills = db.get_all_bills(st.session_state.user_id)
-        except:
+        except Exception:
             bills = []
         
         if bills:
@@ -780,6 +772,15 @@ def study_center_page():
                 </div>
                 """, unsafe_allow_html=True)
 
+# Dot color per task category in the active task list
+CATEGORY_COLORS = {
+    "Health": "#2ecc71",
+    "Finance": "#f39c12",
+    "Study": "#3498db",
+    "Personal": "#9b59b6",
+    "Work": "#e74c3c"
+}
+
 def productivity_page():
     """Render Productivity Tools page"""
     st.markdown('<h1 class="page-title">⚡ Productivity Hub</h1>', unsafe_allow_html=True)
@@ -815,13 +816,7 @@ def productivity_page():
                 with st.container():
                     col_a, col_b, col_c = st.columns([3, 1, 1])
                     with col_a:
-                        category_color = {
-                            "Health": "#2ecc71",
-                            "Finance": "#f39c12",
-                            "Study": "#3498db",
-                            "Personal": "#9b59b6",
-                            "Work": "#e74c3c"
-                        }.get(task['category'], "#95a5a6")
+                        category_color = CATEGORY_COLORS.get(task['category'], "#95a5a6")
                         
                         st.markdown(f"""
                         <div class="list-item">
@@ -932,19 +927,34 @@ def profile_page():
         # Settings
         st.markdown("### ⚙️ Settings")
         
+        user_id = st.session_state.user_id
+        
         with st.expander("🔔 Notification Settings", expanded=False):
-            email_notifications = st.checkbox("Email Notifications", value=True)
-            push_reminders = st.checkbox("Push Reminders", value=True)
-            weekly_reports = st.checkbox("Weekly Progress Reports", value=True)
+            email_notifications = st.checkbox("Email Notifications",
+                                              value=db.get_user_setting(user_id, "email_notifications", True))
+            push_reminders = st.checkbox("Push Reminders",
+                                         value=db.get_user_setting(user_id, "push_reminders", True))
+            weekly_reports = st.checkbox("Weekly Progress Reports",
+                                         value=db.get_user_setting(user_id, "weekly_reports", True))
             
             if st.button("Save Notification Settings", key="save_notifications"):
+                db.set_user_setting(user_id, "email_notifications", email_notifications)
+                db.set_user_setting(user_id, "push_reminders", push_reminders)
+                db.set_user_setting(user_id, "weekly_reports", weekly_reports)
                 st.success("Notification settings saved!")
         
         with st.expander("🎨 Theme Settings", expanded=False):
-            theme = st.selectbox("Theme", ["Light", "Dark", "Auto"])
-            font_size = st.select_slider("Font Size", options=["Small", "Medium", "Large"], value="Medium")
+            themes = ["Light", "Dark", "Auto"]
+            font_sizes = ["Small", "Medium", "Large"]
+            saved_theme = db.get_user_setting(user_id, "theme", "Light")
+            theme = st.selectbox("Theme", themes,
+                                 index=themes.index(saved_theme) if saved_theme in themes else 0)
+            font_size = st.select_slider("Font Size", options=font_sizes,
+                                         value=db.get_user_setting(user_id, "font_size", "Medium"))
             
             if st.button("Apply Theme", key="apply_theme"):
+                db.set_user_setting(user_id, "theme", theme)
+                db.set_user_setting(user_id, "font_size", font_size)
                 st.success("Theme settings applied!")
         
         with st.expander("🔐 Security", expanded=False):
@@ -953,7 +963,7 @@ def profile_page():
             if st.button("📧 Request Password Reset", key="reset_password"):
                 st.success("Password reset instructions sent to your email!")
 
-def run_ai_analysis(user_inputs):
+def run_ai_analysis(user_inputs, use_cache: bool = True):
     """Run AI analysis with user context"""
     with st.spinner("🧠 LifeOps AI is analyzing your life with multi-agent intelligence..."):
         try:
@@ -966,7 +976,8 @@ def run_ai_analysis(user_inputs):
             # Try CrewAI first, then fallback to direct Gemini
             results = None
             try:
-                crew = LifeOpsCrew(user_inputs)
+                crew = LifeOpsCrew(user_inputs, user_id=st.session_state.user_id,
+                                   use_cache=use_cache)
                 results = crew.kickoff()
                 st.success("✅ AI analysis complete!")
             except Exception as crew_error:
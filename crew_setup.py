@@ -12,24 +12,40 @@ os.environ["OPENAI_MODEL_NAME"] = ""
 
 from agents import LifeOpsAgents
 from tasks import LifeOpsTasks
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import json
-from langchain_google_genai import ChatGoogleGenerativeAI
+import threading
+from utils import parse_batched_output
+import task_cache
+
+# Process-wide LRU of Gemini responses keyed on the user id and the
+# whitespace-normalized prompt, so a user re-running an analysis with
+# unchanged inputs skips the LLM without ever seeing another user's answer.
+_RESPONSE_CACHE_SIZE = 1000
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+# A batched section shorter than this was most likely cut off by the
+# shared output budget, so it is regenerated with its own call
+_MIN_SECTION_LENGTH = 200
 
 class LifeOpsCrew:
     """Main crew orchestrator for LifeOps AI v2 - Direct Gemini Implementation"""
     
-    def __init__(self, user_context: Dict[str, Any]):
+    def __init__(self, user_context: Dict[str, Any], user_id: Optional[int] = None,
+                 use_cache: bool = True):
         self.user_context = user_context
+        self.user_id = user_id
+        # False asks Gemini again instead of reusing a cached response; the
+        # fresh answers still replace the cached ones
+        self.use_cache = use_cache
         self.agents = LifeOpsAgents()
         self.tasks = LifeOpsTasks(user_context)
         
-        # Direct Gemini LLM for fallback generation
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-pro",
-            temperature=0.7,
-            google_api_key=os.getenv("GOOGLE_API_KEY")
-        )
+        # Direct Gemini LLM for fallback generation, shared with the agents
+        self.llm = self.agents.llm
     
     def kickoff(self) -> Dict[str, Any]:
         """Execute the complete LifeOps analysis v2 - Direct Gemini Implementation"""
@@ -37,11 +53,27 @@ class LifeOpsCrew:
         print("🚀 Starting LifeOps AI Analysis...")
         
         try:
-            # Generate real analysis using Gemini directly
-            health_result = self._generate_health_analysis()
-            finance_result = self._generate_finance_analysis()
-            study_result = self._generate_study_analysis()
-            coordination_result = self._generate_coordination_analysis(health_result, finance_result, study_result)
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                if self.user_context.get('batch_mode', False):
+                    # Opt-in: one call carrying all three domain prompts
+                    health_result, finance_result, study_result = self._generate_domain_analyses_batched()
+                else:
+                    # The three domain calls are independent, so run them side by side.
+                    # Each one already falls back to its default analysis on error.
+                    health_future = pool.submit(self._generate_health_analysis)
+                    finance_future = pool.submit(self._generate_finance_analysis)
+                    study_future = pool.submit(self._generate_study_analysis)
+                    health_result = health_future.result()
+                    finance_result = finance_future.result()
+                    study_result = study_future.result()
+                
+                # Coordination and cross-domain insights only need the three results
+                coordination_future = pool.submit(self._generate_coordination_analysis,
+                                                  health_result, finance_result, study_result)
+                insights_future = pool.submit(self._generate_cross_domain_insights,
+                                              health_result, finance_result, study_result)
+                coordination_result = coordination_future.result()
+                insights_result = insights_future.result()
             
             # Compile results
             results = {
@@ -56,7 +88,7 @@ class LifeOpsCrew:
                     "study_approved": "✅ Verified",
                     "overall_score": self._calculate_score(health_result, finance_result, study_result)
                 },
-                "cross_domain_insights": self._generate_cross_domain_insights(health_result, finance_result, study_result),
+                "cross_domain_insights": insights_result,
                 "user_context": self.user_context
             }
             
@@ -68,9 +100,70 @@ class LifeOpsCrew:
             # Return meaningful fallback
             return self._generate_fallback_results()
     
+    def _invoke(self, prompt: str) -> str:
+        """Call Gemini, reusing this user's cached response (memory, then disk) for an identical prompt"""
+        key = (self.user_id, " ".join(prompt.split()))
+        if self.use_cache:
+            with _response_cache_lock:
+                if key in _response_cache:
+                    _response_cache.move_to_end(key)
+                    return _response_cache[key]
+        
+        disk_key = task_cache.make_key(str(self.user_id), self.llm.model, key[1])
+        content = task_cache.get(disk_key) if self.use_cache else None
+        if content is None:
+            content = self.llm.invoke(prompt).content
+            task_cache.put(disk_key, content)
+        
+        with _response_cache_lock:
+            _response_cache[key] = content
+            if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+        return content
+    
+    def _generate_domain_analyses_batched(self) -> tuple:
+        """Generate health, finance and study analyses with a single Gemini call"""
+        prompt = f"""Answer the three numbered requests below for the same user.
+
+[1] HEALTH
+{self._health_prompt()}
+
+[2] FINANCE
+{self._finance_prompt()}
+
+[3] STUDY
+{self._study_prompt()}
+
+Return three sections in order, each starting on its own line with its delimiter:
+===SECTION 1=== for [1], ===SECTION 2=== for [2] and ===SECTION 3=== for [3]."""
+
+        try:
+            sections = parse_batched_output(self._invoke(prompt))
+        except Exception:
+            sections = {}
+        
+        # A section the model dropped or cut short gets its own call, which
+        # falls back to the default analysis only if that call fails too
+        results = []
+        for name, generate in (('health', self._generate_health_analysis),
+                               ('finance', self._generate_finance_analysis),
+                               ('study', self._generate_study_analysis)):
+            text = sections.get(name, '')
+            results.append(text if len(text) >= _MIN_SECTION_LENGTH else generate())
+        return tuple(results)
+    
     def _generate_health_analysis(self) -> str:
         """Generate health analysis"""
-        prompt = f"""As a Health and Wellness Expert, provide comprehensive health recommendations:
+        prompt = self._health_prompt()
+
+        try:
+            return self._invoke(prompt)
+        except Exception:
+            return self._get_default_health_analysis()
+    
+    def _health_prompt(self) -> str:
+        """Build the health analysis prompt"""
+        return f"""As a Health and Wellness Expert, provide comprehensive health recommendations:
 
 USER CONTEXT:
 - Stress Level: {self.user_context.get('stress_level', 5)}/10
@@ -90,20 +183,23 @@ YOUR ANALYSIS MUST INCLUDE:
 
 Format your response with clear headings, bullet points, and a friendly, professional tone.
 Focus on actionable, practical advice that can be implemented immediately."""
-
-        try:
-            response = self.llm.invoke(prompt)
-            return response.content
-        except:
-            return self._get_default_health_analysis()
     
     def _generate_finance_analysis(self) -> str:
         """Generate finance analysis using Gemini"""
+        prompt = self._finance_prompt()
+
+        try:
+            return self._invoke(prompt)
+        except Exception:
+            return self._get_default_finance_analysis()
+    
+    def _finance_prompt(self) -> str:
+        """Build the finance analysis prompt"""
         monthly_budget = self.user_context.get('monthly_budget', 2000)
         current_expenses = self.user_context.get('current_expenses', 1500)
         savings = max(0, monthly_budget - current_expenses)
         
-        prompt = f"""As a Personal Finance Advisor, provide comprehensive financial recommendations:
+        return f"""As a Personal Finance Advisor, provide comprehensive financial recommendations:
 
 USER CONTEXT:
 - Monthly Budget: ${monthly_budget}
@@ -124,19 +220,22 @@ YOUR ANALYSIS MUST INCLUDE:
 
 Format your response with clear headings, bullet points, and specific numbers.
 Provide concrete advice like "Reduce coffee shop spending by $50/week"."""
-
-        try:
-            response = self.llm.invoke(prompt)
-            return response.content
-        except:
-            return self._get_default_finance_analysis()
     
     def _generate_study_analysis(self) -> str:
         """Generate study analysis using Gemini"""
+        prompt = self._study_prompt()
+
+        try:
+            return self._invoke(prompt)
+        except Exception:
+            return self._get_default_study_analysis()
+    
+    def _study_prompt(self) -> str:
+        """Build the study analysis prompt"""
         days_until_exam = self.user_context.get('days_until_exam', 30)
         study_hours = self.user_context.get('current_study_hours', 3)
         
-        prompt = f"""As a Learning Specialist, provide comprehensive study recommendations:
+        return f"""As a Learning Specialist, provide comprehensive study recommendations:
 
 USER CONTEXT:
 - Exam Date: {self.user_context.get('exam_date', 'Not specified')}
@@ -155,12 +254,6 @@ YOUR ANALYSIS MUST INCLUDE:
 
 Format your response with clear headings, bullet points, and specific time allocations.
 Include a sample daily schedule with exact time blocks."""
-
-        try:
-            response = self.llm.invoke(prompt)
-            return response.content
-        except:
-            return self._get_default_study_analysis()
     
     def _generate_coordination_analysis(self, health: str, finance: str, study: str) -> str:
         """Generate integrated coordination analysis"""
@@ -188,9 +281,8 @@ Format with:
 - Celebration milestones"""
 
         try:
-            response = self.llm.invoke(prompt)
-            return response.content
-        except:
+            return self._invoke(prompt)
+        except Exception:
             return self._get_default_coordination_analysis()
     
     def _generate_cross_domain_insights(self, health: str, finance: str, study: str) -> str:
@@ -209,9 +301,8 @@ Provide 3 insights that connect these domains, like:
 Keep each insight concise (1-2 sentences)."""
 
         try:
-            response = self.llm.invoke(prompt)
-            return response.content
-        except:
+            return self._invoke(prompt)
+        except Exception:
             return "Cross-domain analysis completed. Key insight: Integrating morning routines combining meditation (health), planning (finance), and focused study leads to 40% better daily productivity."
     
     def _calculate_score(self, health: str, finance: str, study: str) -> int:
@@ -294,6 +385,7 @@ Keep each insight concise (1-2 sentences)."""
         budget = self.user_context.get('monthly_budget', 2000)
         expenses = self.user_context.get('current_expenses', 1500)
         savings = max(0, budget - expenses)
+        savings_rate = int(savings / budget * 100) if budget > 0 else 0
         
         return f"""# Financial Planning & Budgeting
 
@@ -301,7 +393,7 @@ Keep each insight concise (1-2 sentences)."""
 - **Monthly Budget**: ${budget}
 - **Current Expenses**: ${expenses}
 - **Monthly Savings**: ${savings}
-- **Savings Rate**: {int((savings/budget*100) if budget > 0 else 0)}%
+- **Savings Rate**: {savings_rate}%
 
 ## 🎯 Financial Recommendations
 ### 1. Budget Optimization
@@ -1,127 +1,663 @@
 """
 LifeOps AI v2 - Enhanced Multi-User Database Module with Migration Support
 """
+import json
+import os
 import sqlite3
 import hashlib
-from datetime import datetime, timedelta
+import hmac
+import secrets
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional
 
+# Oldest SQLite with every feature the schema and queries use: UPSERT
+# (3.24) and generated columns (3.31)
+_MIN_SQLITE_VERSION = (3, 31, 0)
+
+# Applied to every connection. journal_mode=WAL persists in the file and
+# is set once in init_database instead.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Stored as "pbkdf2_sha256$<iterations>$<salt hex>$<hash hex>". Hashes
+# without the prefix are legacy unsalted SHA-256 and get upgraded on login.
+_PASSWORD_SCHEME = "pbkdf2_sha256"
+_PASSWORD_ITERATIONS = 600_000
+
+# Verified against when an email is unknown, so a failed login costs the
+# same PBKDF2 work whether or not the account exists
+_DUMMY_PASSWORD_HASH = f"{_PASSWORD_SCHEME}${_PASSWORD_ITERATIONS}${'00' * 16}${'00' * 32}"
+
+# Tables created by init_database, run as one script in a single transaction
+_SCHEMA_SQL = '''
+    BEGIN;
+
+    -- Users table
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        name TEXT,
+        joined_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        last_login TEXT,
+        subscription_tier TEXT DEFAULT 'free',
+        settings TEXT DEFAULT '{}' CHECK(json_valid(settings))
+    );
+
+    -- Action items/todo list - NOW WITH USER_ID
+    CREATE TABLE IF NOT EXISTS action_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        task TEXT NOT NULL,
+        category TEXT,
+        agent_source TEXT,
+        due_date TEXT,
+        completed INTEGER NOT NULL DEFAULT 0 CHECK (completed IN (0, 1)),
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        completed_at TEXT,
+        completed_date TEXT GENERATED ALWAYS AS (DATE(completed_at)) VIRTUAL
+    );
+
+    -- Medicine vault - NOW WITH USER_ID
+    CREATE TABLE IF NOT EXISTS medicines (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        dosage TEXT,
+        frequency TEXT,
+        time_of_day TEXT,
+        start_date TEXT,
+        end_date TEXT,
+        reminder_enabled INTEGER NOT NULL DEFAULT 1 CHECK (reminder_enabled IN (0, 1)),
+        last_taken TEXT
+    );
+
+    -- Bill tracking - NOW WITH USER_ID
+    CREATE TABLE IF NOT EXISTS bills (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        amount REAL,
+        due_day INTEGER,
+        category TEXT,
+        is_recurring INTEGER NOT NULL DEFAULT 1 CHECK (is_recurring IN (0, 1)),
+        paid_this_month INTEGER NOT NULL DEFAULT 0 CHECK (paid_this_month IN (0, 1))
+    );
+
+    -- Study sessions - NOW WITH USER_ID
+    CREATE TABLE IF NOT EXISTS study_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        date TEXT,
+        duration_minutes INTEGER,
+        subject TEXT,
+        productivity_score INTEGER,
+        notes TEXT
+    );
+
+    -- Weekly progress - NOW WITH USER_ID
+    CREATE TABLE IF NOT EXISTS weekly_progress (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        week_start TEXT,
+        health_score INTEGER,
+        finance_score INTEGER,
+        study_score INTEGER,
+        consistency_streak INTEGER,
+        reflections TEXT
+    );
+
+    -- Smart notes - NOW WITH USER_ID
+    CREATE TABLE IF NOT EXISTS smart_notes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        title TEXT,
+        content TEXT,
+        tags TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+
+    COMMIT;
+'''
+
+# Indexes for the user-scoped queries below. Partial indexes only hold the
+# rows their query can return. users.email needs none: its UNIQUE
+# constraint already creates one.
+_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_actions_pending_cover ON action_items"
+    "(user_id, created_at DESC, task, category, agent_source, due_date, completed) WHERE completed = 0",
+    "CREATE INDEX IF NOT EXISTS idx_actions_completed_date ON action_items(user_id, completed_date) WHERE completed = 1",
+    "CREATE INDEX IF NOT EXISTS idx_meds_user_cover ON medicines"
+    "(user_id, end_date, time_of_day, name, dosage, frequency, last_taken)",
+    "CREATE INDEX IF NOT EXISTS idx_bills_recurring_cover ON bills"
+    "(user_id, due_day, name, amount, category, paid_this_month, is_recurring) WHERE is_recurring = 1",
+    "CREATE INDEX IF NOT EXISTS idx_study_user_date ON study_sessions(user_id, date DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_notes_user_upd ON smart_notes(user_id, updated_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_actions_user_created ON action_items(user_id, created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_meds_user_name ON medicines(user_id, name)",
+    "CREATE INDEX IF NOT EXISTS idx_bills_user_name ON bills(user_id, name)",
+)
+
+# Prepared statement SQL. Module-level constants keep each statement
+# text identical across calls so sqlite3's statement cache reuses it.
+
+_SQL_CREATE_USER = '''
+    INSERT INTO users (email, password_hash, name)
+    VALUES (?, ?, ?)
+'''
+
+_SQL_AUTHENTICATE_USER = '''
+    SELECT id, email, name, joined_at, subscription_tier, settings, password_hash
+    FROM users
+    WHERE email = ?
+'''
+
+_SQL_REHASH_PASSWORD = '''
+    UPDATE users
+    SET password_hash = ?, last_login = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+
+_SQL_TOUCH_LAST_LOGIN = '''
+    UPDATE users
+    SET last_login = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+
+_SQL_GET_USER_SETTING = '''
+    SELECT json_type(settings, ?) as type, json_extract(settings, ?) as value
+    FROM users
+    WHERE id = ?
+'''
+
+_SQL_SET_USER_SETTING = '''
+    UPDATE users
+    SET settings = json_set(COALESCE(settings, '{}'), ?, json(?))
+    WHERE id = ?
+'''
+
+_SQL_GET_USER = '''
+    SELECT id, email, name, joined_at, last_login, subscription_tier, settings
+    FROM users
+    WHERE id = ?
+'''
+
+_SQL_ADD_ACTION = '''
+    INSERT INTO action_items (user_id, task, category, agent_source, due_date)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+_SQL_GET_PENDING_ACTIONS = '''
+    SELECT id, task, category, agent_source, due_date, created_at
+    FROM action_items
+    WHERE user_id = ? AND completed = 0
+    ORDER BY created_at DESC
+'''
+
+_SQL_GET_ALL_ACTIONS = '''
+    SELECT id, task, category, agent_source, due_date, completed, created_at, completed_at
+    FROM action_items
+    WHERE user_id = ?
+    ORDER BY created_at DESC
+    LIMIT ?
+'''
+
+_SQL_COMPLETE_ACTION = '''
+    UPDATE action_items
+    SET completed = 1, completed_at = CURRENT_TIMESTAMP
+    WHERE id = ? AND user_id = ?
+'''
+
+_SQL_COMPLETE_ACTIONS = '''
+    UPDATE action_items
+    SET completed = 1, completed_at = CURRENT_TIMESTAMP
+    WHERE user_id = ? AND id IN ({placeholders})
+'''
+
+# Ids bound per IN (...) list, well under SQLite's older 999-parameter limit
+_IN_CHUNK_SIZE = 500
+
+_SQL_DELETE_ACTION = 'DELETE FROM action_items WHERE id = ? AND user_id = ?'
+
+_SQL_CONSISTENCY_STREAK = '''
+    WITH RECURSIVE days(d) AS (
+        SELECT DISTINCT completed_date
+        FROM action_items
+        WHERE user_id = ? AND completed = 1 AND completed_date IS NOT NULL
+    ),
+    streak(d, n) AS (
+        SELECT d, 1 FROM days
+        WHERE d = (SELECT MAX(d) FROM days WHERE d >= ?)
+        UNION ALL
+        SELECT days.d, streak.n + 1
+        FROM days JOIN streak ON days.d = DATE(streak.d, '-1 day')
+    )
+    SELECT COALESCE(MAX(n), 0) as streak FROM streak
+'''
+
+_SQL_ADD_MEDICINE = '''
+    INSERT INTO medicines (user_id, name, dosage, frequency, time_of_day, start_date)
+    VALUES (?, ?, ?, ?, ?, DATE('now'))
+'''
+
+_SQL_GET_TODAYS_MEDICINES = '''
+    SELECT id, name, dosage, frequency, time_of_day, last_taken
+    FROM medicines
+    WHERE user_id = ? AND (end_date IS NULL OR end_date >= ?)
+    ORDER BY time_of_day
+'''
+
+_SQL_GET_ALL_MEDICINES = '''
+    SELECT id, name, dosage, frequency, time_of_day, last_taken
+    FROM medicines
+    WHERE user_id = ?
+    ORDER BY name
+'''
+
+_SQL_DELETE_MEDICINE = 'DELETE FROM medicines WHERE id = ? AND user_id = ?'
+
+_SQL_MEDICINE_TAKEN = '''
+    UPDATE medicines
+    SET last_taken = CURRENT_TIMESTAMP
+    WHERE id = ? AND user_id = ?
+'''
+
+_SQL_ADD_BILL = '''
+    INSERT INTO bills (user_id, name, amount, due_day, category)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+_SQL_GET_MONTHLY_BILLS = '''
+    SELECT id, name, amount, due_day, category, paid_this_month
+    FROM bills
+    WHERE user_id = ? AND is_recurring = 1
+    ORDER BY due_day
+'''
+
+_SQL_GET_ALL_BILLS = '''
+    SELECT id, name, amount, due_day, category, is_recurring, paid_this_month
+    FROM bills
+    WHERE user_id = ?
+    ORDER BY name
+'''
+
+_SQL_DELETE_BILL = 'DELETE FROM bills WHERE id = ? AND user_id = ?'
+
+_SQL_MARK_BILL_PAID = '''
+    UPDATE bills
+    SET paid_this_month = 1
+    WHERE id = ? AND user_id = ?
+'''
+
+_SQL_ADD_STUDY_SESSION = '''
+    INSERT INTO study_sessions (user_id, date, duration_minutes, subject, productivity_score)
+    VALUES (?, DATE('now'), ?, ?, ?)
+'''
+
+_SQL_WEEKLY_STUDY_SUMMARY = '''
+    SELECT
+        COALESCE(SUM(duration_minutes), 0) as total_minutes,
+        COALESCE(AVG(productivity_score), 0.0) as avg_score,
+        COUNT(*) as sessions
+    FROM study_sessions
+    WHERE user_id = ? AND date >= ?
+'''
+
+_SQL_GET_STUDY_SESSIONS = '''
+    SELECT id, date, duration_minutes, subject, productivity_score
+    FROM study_sessions
+    WHERE user_id = ?
+    ORDER BY date DESC
+    LIMIT ?
+'''
+
+_SQL_SAVE_WEEKLY_PROGRESS = '''
+    INSERT INTO weekly_progress (user_id, week_start, health_score, finance_score,
+                                 study_score, consistency_streak, reflections)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, week_start) DO UPDATE SET
+        health_score = excluded.health_score,
+        finance_score = excluded.finance_score,
+        study_score = excluded.study_score,
+        consistency_streak = excluded.consistency_streak,
+        reflections = excluded.reflections
+'''
+
+_SQL_GET_WEEKLY_PROGRESS = '''
+    SELECT id, week_start, health_score, finance_score, study_score, consistency_streak, reflections
+    FROM weekly_progress
+    WHERE user_id = ?
+    ORDER BY week_start DESC
+    LIMIT ?
+'''
+
+_SQL_ADD_NOTE = '''
+    INSERT INTO smart_notes (user_id, title, content, tags)
+    VALUES (?, ?, ?, ?)
+'''
+
+_SQL_GET_NOTES = '''
+    SELECT id, title, content, tags, created_at, updated_at
+    FROM smart_notes
+    WHERE user_id = ?
+    ORDER BY updated_at DESC
+    LIMIT ?
+'''
+
+_SQL_UPDATE_NOTE = '''
+    UPDATE smart_notes
+    SET title = ?, content = ?, tags = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ? AND user_id = ?
+'''
+
+_SQL_DELETE_NOTE = 'DELETE FROM smart_notes WHERE id = ? AND user_id = ?'
+
+_SQL_USER_STATISTICS = '''
+    SELECT
+        (SELECT COUNT(*) FROM action_items WHERE user_id = ?) as total_actions,
+        (SELECT COUNT(*) FROM action_items WHERE user_id = ? AND completed = 1) as completed_actions,
+        (SELECT COUNT(*) FROM medicines WHERE user_id = ?) as medicines_count,
+        (SELECT COUNT(*) FROM bills WHERE user_id = ?) as bills_count,
+        (SELECT COUNT(*) FROM smart_notes WHERE user_id = ?) as notes_count
+'''
+
+_SQL_LIST_TABLES = "SELECT name FROM sqlite_master WHERE type='table'"
+
+_SQL_COUNT_USERS = "SELECT COUNT(*) FROM users"
+
+
+# Tables each cached read depends on, so a write only evicts the reads it affects
+_CACHE_TABLES = {
+    'user': ('users',),
+    'pending': ('action_items',),
+    'todays_meds': ('medicines',),
+    'medicines': ('medicines',),
+    'monthly_bills': ('bills',),
+    'bills': ('bills',),
+    'notes': ('smart_notes',),
+    'progress': ('weekly_progress',),
+    'stats': ('action_items', 'medicines', 'bills', 'smart_notes'),
+    'health': ('users',),
+}
+
+def _utc_today(days_ago: int = 0) -> str:
+    """ISO date matching SQLite's DATE('now'), bound as a parameter instead"""
+    return (datetime.now(timezone.utc).date() - timedelta(days=days_ago)).isoformat()
+
+
+# ========== SQL TRACING (set LIFEOPS_SQL_TRACE=1) ==========
+
+_SLOW_QUERY_MS = 5.0
+_EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+
+class _TracingCursor(sqlite3.Cursor):
+    """Cursor that times every statement and explains the slow ones"""
+    
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        result = super().execute(sql, parameters)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms >= _SLOW_QUERY_MS:
+            _report_slow_query(self.connection, sql, parameters, elapsed_ms)
+        return result
+
+
+class _TracingConnection(sqlite3.Connection):
+    """Connection whose cursors and execute() shortcut are traced"""
+    
+    def cursor(self, factory=_TracingCursor):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+
+def _report_slow_query(conn: sqlite3.Connection, sql: str, parameters, elapsed_ms: float):
+    """Print a slow statement and any full table scans in its query plan"""
+    print(f"[sql] {elapsed_ms:.1f} ms: {' '.join(sql.split())}")
+    if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+        return
+    plan = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+    for row in plan:
+        if row[3].startswith('SCAN'):
+            print(f"[sql]     {row[3]}")
+
+
 class LifeOpsDatabase:
     """SQLite database for LifeOps AI v2 with Multi-User Support and Migration"""
     
-    def __init__(self, db_path="lifeops_data.db"):
-        self.db_path = db_path
+    CACHE_TTL = 2.0
+    STATS_TTL = 5.0
+    HEALTH_TTL = 30.0
+    
+    def __init__(self, db_path="lifeops_data.db", pool_size: int = 5, in_memory: bool = False):
+        # in_memory keeps everything in a private shared-cache memory database,
+        # for tests and throwaway sessions. It lives as long as the writer.
+        if sqlite3.sqlite_version_info < _MIN_SQLITE_VERSION:
+            raise RuntimeError(
+                f"LifeOps needs SQLite {'.'.join(map(str, _MIN_SQLITE_VERSION))} or newer, "
+                f"found {sqlite3.sqlite_version}"
+            )
+        
+        self.in_memory = in_memory
+        self.db_path = f"file:lifeops-{id(self)}?mode=memory&cache=shared" if in_memory else db_path
+        self.pool_size = pool_size
+        
+        # One autocommit writer guarded by an in-process lock, plus a pool of
+        # readers grown on demand up to pool_size. WAL lets the readers run
+        # while the writer holds the lock.
+        self._writer = self._connect(isolation_level=None, check_same_thread=False)
+        self._write_lock = threading.RLock()
+        self._readers = queue.Queue()
+        self._reader_count = 0
+        self._pool_lock = threading.Lock()
+        
+        # Short-lived read cache keyed on (method, user_id, ...) so Streamlit
+        # reruns between writes skip SQLite. Writes drop the user's entries.
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        self._cache_generations = {}
+        self._tx_invalidations = []
+        
         self.init_database()
     
+    def _connect(self, read_only: bool = False, **kwargs) -> sqlite3.Connection:
+        """Open a connection with room for every prepared statement in this module"""
+        if os.getenv("LIFEOPS_SQL_TRACE"):
+            kwargs['factory'] = _TracingConnection
+        if self.in_memory:
+            conn = sqlite3.connect(self.db_path, uri=True, cached_statements=256, **kwargs)
+            if read_only:
+                # Shared-cache readers would otherwise fail with "table is
+                # locked" while the writer holds a transaction
+                conn.execute("PRAGMA query_only=ON")
+                conn.execute("PRAGMA read_uncommitted=ON")
+        elif read_only:
+            # mode=ro makes SQLite refuse writes on reader connections
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, cached_statements=256, **kwargs)
+        else:
+            conn = sqlite3.connect(self.db_path, cached_statements=256, **kwargs)
+        conn.row_factory = sqlite3.Row
+        self._configure(conn)
+        return conn
+    
+    def _configure(self, conn: sqlite3.Connection):
+        """Apply the per-connection PRAGMA tuning"""
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+    
+    @contextmanager
+    def _write_conn(self, user_id: int = None, table: str = None):
+        """Hold the write lock and yield the shared autocommit writer"""
+        with self._write_lock:
+            yield self._writer
+        if user_id is not None:
+            self._invalidate(user_id, table)
+    
+    def _mutate(self, user_id: int, table: str, sql: str, params: tuple) -> bool:
+        """Run one user-scoped UPDATE/DELETE and report whether it matched a row"""
+        with self._write_conn(user_id, table) as conn:
+            return conn.execute(sql, params).rowcount > 0
+    
+    def _fetchone(self, sql: str, params: tuple) -> Optional[sqlite3.Row]:
+        """Run a query on a pooled reader and return its first row"""
+        with self._read_conn() as conn:
+            return conn.execute(sql, params).fetchone()
+    
+    def _fetchall(self, sql: str, params: tuple) -> List[sqlite3.Row]:
+        """Run a query on a pooled reader and return every row"""
+        with self._read_conn() as conn:
+            return conn.execute(sql, params).fetchall()
+    
+    def _cached_read(self, key: tuple, loader, ttl: float = None):
+        """Return loader() for key, reusing a result younger than ttl (default CACHE_TTL) seconds"""
+        now = time.monotonic()
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            generation = self._cache_generations.get(key[1], 0)
+        if hit and hit[0] > now:
+            return hit[1]
+        
+        value = loader()
+        with self._cache_lock:
+            # A write for this user landed while the loader ran, so value may
+            # predate it; return it but do not cache it
+            if self._cache_generations.get(key[1], 0) == generation:
+                self._cache[key] = (now + (ttl or self.CACHE_TTL), value)
+        return value
+    
+    def _invalidate(self, user_id: int, table: str = None):
+        """Drop a user's cached reads of table (every table when None) after a write"""
+        with self._cache_lock:
+            self._cache_generations[user_id] = self._cache_generations.get(user_id, 0) + 1
+            for key in [key for key in self._cache
+                        if key[1] == user_id and (table is None or table in _CACHE_TABLES[key[0]])]:
+                del self._cache[key]
+            if self._writer.in_transaction:
+                # Evicted again when the transaction ends, in case a read
+                # cached the rows from before the commit in the meantime
+                self._tx_invalidations.append((user_id, table))
+    
+    @contextmanager
+    def transaction(self):
+        """Run several writes in one BEGIN IMMEDIATE ... COMMIT; nested calls join the outer one"""
+        with self._write_lock:
+            if self._writer.in_transaction:
+                yield self._writer
+                return
+            
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._writer
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+            else:
+                self._writer.execute("COMMIT")
+            finally:
+                with self._cache_lock:
+                    pending, self._tx_invalidations = self._tx_invalidations, []
+                for user_id, table in pending:
+                    self._invalidate(user_id, table)
+    
+    @contextmanager
+    def _read_conn(self):
+        """Borrow a reader connection, opening one if the pool is not full yet"""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                grow = self._reader_count < self.pool_size
+                if grow:
+                    self._reader_count += 1
+            conn = self._connect(read_only=True, check_same_thread=False) if grow else self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+    
+    def close(self):
+        """Close the writer and every pooled reader connection"""
+        with self._write_lock:
+            # Refresh planner statistics for tables that changed a lot
+            self._writer.execute("PRAGMA optimize")
+            self._writer.close()
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        self._reader_count = 0
+    
     def init_database(self):
         """Initialize database with required tables and multi-user support"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
+        # WAL is stored in the database file, so setting it once is enough
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
         # Check if we need to migrate from old schema
         self._check_and_migrate(cursor)
         
-        # Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                name TEXT,
-                joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_login TIMESTAMP,
-                subscription_tier TEXT DEFAULT 'free',
-                settings TEXT DEFAULT '{}'
-            )
-        ''')
+        # All tables in one transaction
+        cursor.executescript(_SCHEMA_SQL)
         
-        # Action items/todo list - NOW WITH USER_ID
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS action_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                task TEXT NOT NULL,
-                category TEXT,
-                agent_source TEXT,
-                due_date DATE,
-                completed BOOLEAN DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                completed_at TIMESTAMP
-            )
-        ''')
+        # One progress row per user and week so saves can upsert
+        self._ensure_weekly_progress_unique(cursor)
         
-        # Medicine vault - NOW WITH USER_ID
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS medicines (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                name TEXT NOT NULL,
-                dosage TEXT,
-                frequency TEXT,
-                time_of_day TEXT,
-                start_date DATE,
-                end_date DATE,
-                reminder_enabled BOOLEAN DEFAULT 1,
-                last_taken TIMESTAMP
-            )
-        ''')
+        # Databases created before completed_date existed get it added in place
+        cursor.execute("PRAGMA table_xinfo(action_items)")
+        if 'completed_date' not in [col[1] for col in cursor.fetchall()]:
+            cursor.execute('''
+                ALTER TABLE action_items
+                ADD COLUMN completed_date TEXT GENERATED ALWAYS AS (DATE(completed_at)) VIRTUAL
+            ''')
         
-        # Bill tracking - NOW WITH USER_ID
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS bills (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                name TEXT NOT NULL,
-                amount REAL,
-                due_day INTEGER,
-                category TEXT,
-                is_recurring BOOLEAN DEFAULT 1,
-                paid_this_month BOOLEAN DEFAULT 0
-            )
-        ''')
+        # Per-user indexes matching each query's filter and sort order
+        for statement in _INDEX_SQL:
+            cursor.execute(statement)
         
-        # Study sessions - NOW WITH USER_ID
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS study_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                date DATE,
-                duration_minutes INTEGER,
-                subject TEXT,
-                productivity_score INTEGER,
-                notes TEXT
-            )
-        ''')
+        # Give the planner statistics the first time the indexes exist
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if not cursor.fetchone():
+            cursor.execute("ANALYZE")
+        
+        conn.commit()
+        conn.execute("PRAGMA optimize")
+        conn.close()
+    
+    def _ensure_weekly_progress_unique(self, cursor):
+        """Collapse duplicate weeks left by older versions and enforce uniqueness"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_weekly_progress_user_week'")
+        if cursor.fetchone():
+            return
         
-        # Weekly progress - NOW WITH USER_ID
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS weekly_progress (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                week_start DATE,
-                health_score INTEGER,
-                finance_score INTEGER,
-                study_score INTEGER,
-                consistency_streak INTEGER,
-                reflections TEXT
+            DELETE FROM weekly_progress
+            WHERE id NOT IN (
+                SELECT MAX(id) FROM weekly_progress
+                GROUP BY user_id, week_start
             )
         ''')
-        
-        # Smart notes - NOW WITH USER_ID
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS smart_notes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                title TEXT,
-                content TEXT,
-                tags TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_weekly_progress_user_week
+            ON weekly_progress(user_id, week_start)
         ''')
-        
-        conn.commit()
-        conn.close()
     
     def _check_and_migrate(self, cursor):
         """Check for old schema and migrate if needed"""
@@ -145,25 +681,34 @@ class LifeOpsDatabase:
     # ========== USER AUTHENTICATION METHODS ==========
     
     def hash_password(self, password: str) -> str:
-        """Hash password for secure storage"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Hash password with salted PBKDF2-HMAC-SHA256 for secure storage"""
+        salt = secrets.token_bytes(16)
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, _PASSWORD_ITERATIONS)
+        return f"{_PASSWORD_SCHEME}${_PASSWORD_ITERATIONS}${salt.hex()}${digest.hex()}"
+    
+    def verify_password(self, password: str, stored_hash: str) -> bool:
+        """Check a password against a PBKDF2 or legacy SHA-256 hash"""
+        if not stored_hash.startswith(_PASSWORD_SCHEME + "$"):
+            legacy = hashlib.sha256(password.encode()).hexdigest()
+            return hmac.compare_digest(legacy, stored_hash)
+        
+        _, iterations, salt, expected = stored_hash.split("$")
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode(), bytes.fromhex(salt), int(iterations))
+        return hmac.compare_digest(digest.hex(), expected)
+    
+    def _needs_rehash(self, stored_hash: str) -> bool:
+        """True for legacy hashes and PBKDF2 hashes below the current work factor"""
+        return not stored_hash.startswith(f"{_PASSWORD_SCHEME}${_PASSWORD_ITERATIONS}$")
     
     def create_user(self, email: str, password: str, name: str = "") -> Optional[int]:
         """Create a new user account"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
             password_hash = self.hash_password(password)
             
-            cursor.execute('''
-                INSERT INTO users (email, password_hash, name)
-                VALUES (?, ?, ?)
-            ''', (email, password_hash, name))
+            with self._write_conn() as conn:
+                cursor = conn.execute(_SQL_CREATE_USER, (email, password_hash, name))
             
-            user_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            return user_id
+            return cursor.lastrowid
         except sqlite3.IntegrityError:
             # Email already exists
             return None
@@ -174,31 +719,29 @@ class LifeOpsDatabase:
     def authenticate_user(self, email: str, password: str) -> Optional[Dict]:
         """Authenticate user and return user data"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+            with self._read_conn() as conn:
+                row = conn.execute(_SQL_AUTHENTICATE_USER, (email,)).fetchone()
             
-            password_hash = self.hash_password(password)
-            
-            cursor.execute('''
-                SELECT id, email, name, joined_at, subscription_tier, settings
-                FROM users 
-                WHERE email = ? AND password_hash = ?
-            ''', (email, password_hash))
+            if not row:
+                self.verify_password(password, _DUMMY_PASSWORD_HASH)
+                return None
+            if not self.verify_password(password, row['password_hash']):
+                return None
             
-            user = cursor.fetchone()
+            user = dict(row)
+            stored_hash = user.pop('password_hash')
             
-            if user:
+            if self._needs_rehash(stored_hash):
+                # Upgrade old hashes while the plaintext is at hand
+                new_hash = self.hash_password(password)
+                with self._write_conn(user['id'], 'users') as conn:
+                    conn.execute(_SQL_REHASH_PASSWORD, (new_hash, user['id']))
+            else:
                 # Update last login
-                cursor.execute('''
-                    UPDATE users 
-                    SET last_login = CURRENT_TIMESTAMP 
-                    WHERE id = ?
-                ''', (user['id'],))
-                conn.commit()
+                with self._write_conn(user['id'], 'users') as conn:
+                    conn.execute(_SQL_TOUCH_LAST_LOGIN, (user['id'],))
             
-            conn.close()
-            return dict(user) if user else None
+            return user
         except Exception as e:
             print(f"Error authenticating user: {e}")
             return None
@@ -206,106 +749,84 @@ class LifeOpsDatabase:
     def get_user_by_id(self, user_id: int) -> Optional[Dict]:
         """Get user by ID"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT id, email, name, joined_at, last_login, subscription_tier, settings
-                FROM users 
-                WHERE id = ?
-            ''', (user_id,))
-            
-            user = cursor.fetchone()
-            conn.close()
+            user = self._cached_read(('user', user_id),
+                                     lambda: self._fetchone(_SQL_GET_USER, (user_id,)))
             return dict(user) if user else None
         except Exception as e:
             print(f"Error getting user: {e}")
             return None
     
+    def get_user_setting(self, user_id: int, key: str, default: Any = None) -> Any:
+        """Read one key from the user's JSON settings without loading the whole blob"""
+        path = '$.' + json.dumps(key)
+        row = self._fetchone(_SQL_GET_USER_SETTING, (path, path, user_id))
+        if not row or row['type'] is None:
+            return default
+        if row['type'] in ('true', 'false'):
+            return row['type'] == 'true'
+        if row['type'] in ('object', 'array'):
+            return json.loads(row['value'])
+        return row['value']
+    
+    def set_user_setting(self, user_id: int, key: str, value: Any) -> bool:
+        """Write one key into the user's JSON settings in place"""
+        path = '$.' + json.dumps(key)
+        return self._mutate(user_id, 'users', _SQL_SET_USER_SETTING, (path, json.dumps(value), user_id))
+    
     # ========== ACTION ITEMS METHODS (User-specific) ==========
     
     def add_action_item(self, user_id: int, task: str, category: str = None, 
                        agent_source: str = None, due_date: str = None) -> int:
         """Add action item for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO action_items (user_id, task, category, agent_source, due_date)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (user_id, task, category, agent_source, due_date))
+        with self._write_conn(user_id, 'action_items') as conn:
+            cursor = conn.execute(_SQL_ADD_ACTION, (user_id, task, category, agent_source, due_date))
         item_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
         return item_id
     
+    def add_action_items_bulk(self, user_id: int, items: List[tuple]) -> int:
+        """Add many (task, category, agent_source, due_date) items in one transaction"""
+        rows = [(user_id, *item) for item in items]
+        with self.transaction() as conn:
+            conn.executemany(_SQL_ADD_ACTION, rows)
+        self._invalidate(user_id, 'action_items')
+        return len(rows)
+    
     def get_pending_actions(self, user_id: int) -> List[Dict]:
         """Get pending actions for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM action_items 
-            WHERE user_id = ? AND completed = 0 
-            ORDER BY created_at DESC
-        ''', (user_id,))
-        rows = cursor.fetchall()
-        conn.close()
+        rows = self._cached_read(('pending', user_id),
+                                 lambda: self._fetchall(_SQL_GET_PENDING_ACTIONS, (user_id,)))
         return [dict(row) for row in rows]
     
     def get_all_actions(self, user_id: int, limit: int = 50) -> List[Dict]:
         """Get all actions for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM action_items 
-            WHERE user_id = ? 
-            ORDER BY created_at DESC 
-            LIMIT ?
-        ''', (user_id, limit))
-        rows = cursor.fetchall()
-        conn.close()
+        with self._read_conn() as conn:
+            rows = conn.execute(_SQL_GET_ALL_ACTIONS, (user_id, limit)).fetchall()
         return [dict(row) for row in rows]
     
     def mark_action_complete(self, user_id: int, action_id: int) -> bool:
         """Mark action as complete for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            UPDATE action_items 
-            SET completed = 1, completed_at = CURRENT_TIMESTAMP 
-            WHERE id = ? AND user_id = ?
-        ''', (action_id, user_id))
-        affected = cursor.rowcount
-        conn.commit()
-        conn.close()
-        return affected > 0
+        return self._mutate(user_id, 'action_items', _SQL_COMPLETE_ACTION, (action_id, user_id))
+    
+    def mark_actions_complete(self, user_id: int, action_ids: List[int]) -> int:
+        """Mark several actions complete in one transaction, returning how many changed"""
+        changed = 0
+        with self.transaction() as conn:
+            for start in range(0, len(action_ids), _IN_CHUNK_SIZE):
+                chunk = action_ids[start:start + _IN_CHUNK_SIZE]
+                sql = _SQL_COMPLETE_ACTIONS.format(placeholders=",".join("?" * len(chunk)))
+                changed += conn.execute(sql, (user_id, *chunk)).rowcount
+        self._invalidate(user_id, 'action_items')
+        return changed
     
     def delete_action(self, user_id: int, action_id: int) -> bool:
         """Delete action for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM action_items WHERE id = ? AND user_id = ?', (action_id, user_id))
-        affected = cursor.rowcount
-        conn.commit()
-        conn.close()
-        return affected > 0
+        return self._mutate(user_id, 'action_items', _SQL_DELETE_ACTION, (action_id, user_id))
     
     def get_consistency_streak(self, user_id: int) -> int:
-        """Calculate current streak of completed actions for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT COUNT(*) as streak FROM (
-                SELECT DATE(completed_at) as date
-                FROM action_items 
-                WHERE completed = 1 AND user_id = ?
-                GROUP BY DATE(completed_at)
-            )
-        ''', (user_id,))
-        result = cursor.fetchone()
-        conn.close()
+        """Count consecutive days with a completed action, ending today or yesterday"""
+        with self._read_conn() as conn:
+            # A streak stays alive until a full day passes with nothing completed
+            result = conn.execute(_SQL_CONSISTENCY_STREAK, (user_id, _utc_today(days_ago=1))).fetchone()
         return result[0] if result else 0
     
     # ========== MEDICINE VAULT METHODS (User-specific) ==========
@@ -313,247 +834,155 @@ class LifeOpsDatabase:
     def add_medicine(self, user_id: int, name: str, dosage: str, 
                     frequency: str, time_of_day: str = None) -> int:
         """Add medicine for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO medicines (user_id, name, dosage, frequency, time_of_day, start_date)
-            VALUES (?, ?, ?, ?, ?, DATE('now'))
-        ''', (user_id, name, dosage, frequency, time_of_day))
+        with self._write_conn(user_id, 'medicines') as conn:
+            cursor = conn.execute(_SQL_ADD_MEDICINE, (user_id, name, dosage, frequency, time_of_day))
         med_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
         return med_id
     
+    def add_medicines_bulk(self, user_id: int, items: List[tuple]) -> int:
+        """Add many (name, dosage, frequency, time_of_day) medicines in one transaction"""
+        rows = [(user_id, *item) for item in items]
+        with self.transaction() as conn:
+            conn.executemany(_SQL_ADD_MEDICINE, rows)
+        self._invalidate(user_id, 'medicines')
+        return len(rows)
+    
     def get_todays_medicines(self, user_id: int) -> List[Dict]:
         """Get today's medicines for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM medicines 
-            WHERE user_id = ? AND (end_date IS NULL OR end_date >= DATE('now'))
-            ORDER BY time_of_day
-        ''', (user_id,))
-        rows = cursor.fetchall()
-        conn.close()
+        today = _utc_today()
+        rows = self._cached_read(('todays_meds', user_id, today),
+                                 lambda: self._fetchall(_SQL_GET_TODAYS_MEDICINES, (user_id, today)))
         return [dict(row) for row in rows]
     
     def get_all_medicines(self, user_id: int) -> List[Dict]:
         """Get all medicines for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM medicines 
-            WHERE user_id = ?
-            ORDER BY name
-        ''', (user_id,))
-        rows = cursor.fetchall()
-        conn.close()
+        rows = self._cached_read(('medicines', user_id),
+                                 lambda: self._fetchall(_SQL_GET_ALL_MEDICINES, (user_id,)))
         return [dict(row) for row in rows]
     
     def delete_medicine(self, user_id: int, medicine_id: int) -> bool:
         """Delete medicine for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM medicines WHERE id = ? AND user_id = ?', (medicine_id, user_id))
-        affected = cursor.rowcount
-        conn.commit()
-        conn.close()
-        return affected > 0
+        return self._mutate(user_id, 'medicines', _SQL_DELETE_MEDICINE, (medicine_id, user_id))
     
     def update_medicine_taken(self, user_id: int, medicine_id: int) -> bool:
         """Update last taken timestamp for medicine"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            UPDATE medicines 
-            SET last_taken = CURRENT_TIMESTAMP 
-            WHERE id = ? AND user_id = ?
-        ''', (medicine_id, user_id))
-        affected = cursor.rowcount
-        conn.commit()
-        conn.close()
-        return affected > 0
+        return self._mutate(user_id, 'medicines', _SQL_MEDICINE_TAKEN, (medicine_id, user_id))
     
     # ========== BILL TRACKING METHODS (User-specific) ==========
     
     def add_bill(self, user_id: int, name: str, amount: float, 
                 due_day: int, category: str = "Utilities") -> int:
         """Add bill for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO bills (user_id, name, amount, due_day, category)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (user_id, name, amount, due_day, category))
+        with self._write_conn(user_id, 'bills') as conn:
+            cursor = conn.execute(_SQL_ADD_BILL, (user_id, name, amount, due_day, category))
         bill_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
         return bill_id
     
+    def add_bills_bulk(self, user_id: int, items: List[tuple]) -> int:
+        """Add many (name, amount, due_day, category) bills in one transaction"""
+        rows = [(user_id, *item) for item in items]
+        with self.transaction() as conn:
+            conn.executemany(_SQL_ADD_BILL, rows)
+        self._invalidate(user_id, 'bills')
+        return len(rows)
+    
     def get_monthly_bills(self, user_id: int) -> List[Dict]:
         """Get monthly bills for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM bills 
-            WHERE user_id = ? AND is_recurring = 1
-            ORDER BY due_day
-        ''', (user_id,))
-        rows = cursor.fetchall()
-        conn.close()
+        rows = self._cached_read(('monthly_bills', user_id),
+                                 lambda: self._fetchall(_SQL_GET_MONTHLY_BILLS, (user_id,)))
         return [dict(row) for row in rows]
     
     def get_all_bills(self, user_id: int) -> List[Dict]:
         """Get all bills for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM bills 
-            WHERE user_id = ?
-            ORDER BY name
-        ''', (user_id,))
-        rows = cursor.fetchall()
-        conn.close()
+        rows = self._cached_read(('bills', user_id),
+                                 lambda: self._fetchall(_SQL_GET_ALL_BILLS, (user_id,)))
         return [dict(row) for row in rows]
     
     def delete_bill(self, user_id: int, bill_id: int) -> bool:
         """Delete bill for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM bills WHERE id = ? AND user_id = ?', (bill_id, user_id))
-        affected = cursor.rowcount
-        conn.commit()
-        conn.close()
-        return affected > 0
+        return self._mutate(user_id, 'bills', _SQL_DELETE_BILL, (bill_id, user_id))
     
     def mark_bill_paid(self, user_id: int, bill_id: int) -> bool:
         """Mark bill as paid this month"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            UPDATE bills 
-            SET paid_this_month = 1 
-            WHERE id = ? AND user_id = ?
-        ''', (bill_id, user_id))
-        affected = cursor.rowcount
-        conn.commit()
-        conn.close()
-        return affected > 0
+        return self._mutate(user_id, 'bills', _SQL_MARK_BILL_PAID, (bill_id, user_id))
     
     # ========== STUDY SESSION METHODS (User-specific) ==========
     
     def add_study_session(self, user_id: int, duration_minutes: int, 
                          subject: str, productivity_score: int = 5) -> int:
         """Add study session for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO study_sessions (user_id, date, duration_minutes, subject, productivity_score)
-            VALUES (?, DATE('now'), ?, ?, ?)
-        ''', (user_id, duration_minutes, subject, productivity_score))
+        with self._write_conn(user_id, 'study_sessions') as conn:
+            cursor = conn.execute(_SQL_ADD_STUDY_SESSION, (user_id, duration_minutes, subject, productivity_score))
         session_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
         return session_id
     
     def get_weekly_study_summary(self, user_id: int) -> Dict:
         """Get weekly study summary for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT 
-                SUM(duration_minutes) as total_minutes,
-                AVG(productivity_score) as avg_score,
-                COUNT(*) as sessions
-            FROM study_sessions 
-            WHERE user_id = ? AND date >= DATE('now', '-7 days')
-        ''', (user_id,))
-        result = cursor.fetchone()
-        conn.close()
-        if result and result[0]:
-            return {
-                'total_minutes': result[0],
-                'avg_score': float(result[1] or 0),
-                'sessions': result[2]
-            }
-        return {
-            'total_minutes': 0,
-            'avg_score': 0,
-            'sessions': 0
-        }
+        with self._read_conn() as conn:
+            result = conn.execute(_SQL_WEEKLY_STUDY_SUMMARY, (user_id, _utc_today(days_ago=7))).fetchone()
+        # An aggregate without GROUP BY always returns one row, already defaulted by COALESCE
+        return dict(result)
     
     def get_study_sessions(self, user_id: int, limit: int = 20) -> List[Dict]:
         """Get recent study sessions for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM study_sessions 
-            WHERE user_id = ? 
-            ORDER BY date DESC 
-            LIMIT ?
-        ''', (user_id, limit))
-        rows = cursor.fetchall()
-        conn.close()
+        with self._read_conn() as conn:
+            rows = conn.execute(_SQL_GET_STUDY_SESSIONS, (user_id, limit)).fetchall()
+        return [dict(row) for row in rows]
+    
+    # ========== WEEKLY PROGRESS METHODS (User-specific) ==========
+    
+    def save_weekly_progress(self, user_id: int, week_start: str, health_score: int = None,
+                             finance_score: int = None, study_score: int = None,
+                             consistency_streak: int = None, reflections: str = None) -> bool:
+        """Insert or update the progress row for a user's week"""
+        return self._mutate(user_id, 'weekly_progress', _SQL_SAVE_WEEKLY_PROGRESS,
+                            (user_id, week_start, health_score, finance_score,
+                             study_score, consistency_streak, reflections))
+    
+    def save_weekly_progress_bulk(self, user_id: int, weeks: List[tuple]) -> int:
+        """Upsert many (week_start, health, finance, study, streak, reflections) rows in one transaction"""
+        rows = [(user_id, *week) for week in weeks]
+        with self.transaction() as conn:
+            conn.executemany(_SQL_SAVE_WEEKLY_PROGRESS, rows)
+        self._invalidate(user_id, 'weekly_progress')
+        return len(rows)
+    
+    def get_weekly_progress(self, user_id: int, limit: int = 12) -> List[Dict]:
+        """Get most recent weekly progress rows for specific user"""
+        rows = self._cached_read(('progress', user_id, limit),
+                                 lambda: self._fetchall(_SQL_GET_WEEKLY_PROGRESS, (user_id, limit)))
         return [dict(row) for row in rows]
     
     # ========== SMART NOTES METHODS (User-specific) ==========
     
     def add_note(self, user_id: int, title: str, content: str, tags: str = "") -> int:
         """Add note for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO smart_notes (user_id, title, content, tags)
-            VALUES (?, ?, ?, ?)
-        ''', (user_id, title, content, tags))
+        with self._write_conn(user_id, 'smart_notes') as conn:
+            cursor = conn.execute(_SQL_ADD_NOTE, (user_id, title, content, tags))
         note_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
         return note_id
     
+    def add_notes_bulk(self, user_id: int, items: List[tuple]) -> int:
+        """Add many (title, content, tags) notes in one transaction"""
+        rows = [(user_id, *item) for item in items]
+        with self.transaction() as conn:
+            conn.executemany(_SQL_ADD_NOTE, rows)
+        self._invalidate(user_id, 'smart_notes')
+        return len(rows)
+    
     def get_notes(self, user_id: int, limit: int = 20) -> List[Dict]:
         """Get notes for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM smart_notes 
-            WHERE user_id = ? 
-            ORDER BY updated_at DESC 
-            LIMIT ?
-        ''', (user_id, limit))
-        rows = cursor.fetchall()
-        conn.close()
+        rows = self._cached_read(('notes', user_id, limit),
+                                 lambda: self._fetchall(_SQL_GET_NOTES, (user_id, limit)))
         return [dict(row) for row in rows]
     
     def update_note(self, user_id: int, note_id: int, title: str, content: str, tags: str = "") -> bool:
         """Update note for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            UPDATE smart_notes 
-            SET title = ?, content = ?, tags = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ? AND user_id = ?
-        ''', (title, content, tags, note_id, user_id))
-        affected = cursor.rowcount
-        conn.commit()
-        conn.close()
-        return affected > 0
+        return self._mutate(user_id, 'smart_notes', _SQL_UPDATE_NOTE, (title, content, tags, note_id, user_id))
     
     def delete_note(self, user_id: int, note_id: int) -> bool:
         """Delete note for specific user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM smart_notes WHERE id = ? AND user_id = ?', (note_id, user_id))
-        affected = cursor.rowcount
-        conn.commit()
-        conn.close()
-        return affected > 0
+        return self._mutate(user_id, 'smart_notes', _SQL_DELETE_NOTE, (note_id, user_id))
     
     # ========== STATISTICS METHODS ==========
     
@@ -562,36 +991,9 @@ class LifeOpsDatabase:
         stats = {}
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Total actions
-            cursor.execute('SELECT COUNT(*) FROM action_items WHERE user_id = ?', (user_id,))
-            stats['total_actions'] = cursor.fetchone()[0] or 0
-            
-            # Completed actions
-            cursor.execute('SELECT COUNT(*) FROM action_items WHERE user_id = ? AND completed = 1', (user_id,))
-            stats['completed_actions'] = cursor.fetchone()[0] or 0
-            
-            # Medicines count
-            cursor.execute('SELECT COUNT(*) FROM medicines WHERE user_id = ?', (user_id,))
-            stats['medicines_count'] = cursor.fetchone()[0] or 0
-            
-            # Bills count
-            cursor.execute('SELECT COUNT(*) FROM bills WHERE user_id = ?', (user_id,))
-            stats['bills_count'] = cursor.fetchone()[0] or 0
-            
-            # Notes count
-            cursor.execute('SELECT COUNT(*) FROM smart_notes WHERE user_id = ?', (user_id,))
-            stats['notes_count'] = cursor.fetchone()[0] or 0
-            
-            conn.close()
-            
-            # Calculate completion rate
-            if stats['total_actions'] > 0:
-                stats['completion_rate'] = (stats['completed_actions'] / stats['total_actions']) * 100
-            else:
-                stats['completion_rate'] = 0
+            stats = dict(self._cached_read(('stats', user_id),
+                                           lambda: self._load_user_statistics(user_id),
+                                           ttl=self.STATS_TTL))
                 
         except Exception as e:
             print(f"Error getting user statistics: {e}")
@@ -607,6 +1009,47 @@ class LifeOpsDatabase:
         
         return stats
     
+    def _load_user_statistics(self, user_id: int) -> Dict:
+        """Read statistics for a user on a pooled reader"""
+        with self._read_conn() as conn:
+            return self._collect_user_statistics(conn.cursor(), user_id)
+    
+    def _collect_user_statistics(self, cursor, user_id: int) -> Dict:
+        """Run the statistics query on an already open cursor"""
+        cursor.execute(_SQL_USER_STATISTICS, (user_id,) * 5)
+        stats = {key: value or 0 for key, value in dict(cursor.fetchone()).items()}
+        
+        # Calculate completion rate
+        if stats['total_actions'] > 0:
+            stats['completion_rate'] = (stats['completed_actions'] / stats['total_actions']) * 100
+        else:
+            stats['completion_rate'] = 0
+        
+        return stats
+    
+    def get_dashboard(self, user_id: int) -> Dict:
+        """Get pending actions, today's medicines, monthly bills and stats in one connection"""
+        with self._read_conn() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(_SQL_GET_PENDING_ACTIONS, (user_id,))
+            pending = [dict(row) for row in cursor.fetchall()]
+            
+            cursor.execute(_SQL_GET_TODAYS_MEDICINES, (user_id, _utc_today()))
+            meds = [dict(row) for row in cursor.fetchall()]
+            
+            cursor.execute(_SQL_GET_MONTHLY_BILLS, (user_id,))
+            bills = [dict(row) for row in cursor.fetchall()]
+            
+            stats = self._collect_user_statistics(cursor, user_id)
+        
+        return {
+            'pending': pending,
+            'meds': meds,
+            'bills': bills,
+            'stats': stats
+        }
+    
     def check_database_health(self) -> Dict:
         """Check database health and provide status"""
         health = {
@@ -616,21 +1059,27 @@ class LifeOpsDatabase:
         }
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get all tables
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
-            health['tables'] = [table[0] for table in tables]
-            
-            # Count users
-            cursor.execute("SELECT COUNT(*) FROM users")
-            health['user_count'] = cursor.fetchone()[0] or 0
-            
-            conn.close()
+            tables, user_count = self._cached_read(('health', None), self._probe_database,
+                                                   ttl=self.HEALTH_TTL)
+            health['tables'] = list(tables)
+            health['user_count'] = user_count
             
         except Exception as e:
             health['status'] = f'error: {str(e)}'
             
         return health
+    
+    def _probe_database(self) -> tuple:
+        """List table names and count users"""
+        with self._read_conn() as conn:
+            cursor = conn.cursor()
+            
+            # Get all tables
+            cursor.execute(_SQL_LIST_TABLES)
+            tables = tuple(table[0] for table in cursor.fetchall())
+            
+            # Count users
+            cursor.execute(_SQL_COUNT_USERS)
+            user_count = cursor.fetchone()[0] or 0
+        
+        return tables, user_count
@@ -0,0 +1,94 @@
+"""
+LifeOps AI v2 - Persistent LLM response cache
+File: task_cache.py
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import xxhash  # optional, much faster than blake2b on multi-kB prompts
+except ImportError:
+    xxhash = None
+
+CACHE_TTL = 7 * 24 * 3600  # seconds
+
+_SQL_CREATE = '''
+    CREATE TABLE IF NOT EXISTS llm_cache (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+'''
+
+_SQL_GET = 'SELECT value FROM llm_cache WHERE key = ? AND expires_at > ?'
+
+_SQL_SET = '''
+    INSERT INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at
+'''
+
+_SQL_PURGE = 'DELETE FROM llm_cache WHERE expires_at <= ?'
+
+_conn: Optional[sqlite3.Connection] = None
+_disabled = False
+_lock = threading.Lock()
+
+def _connection() -> Optional[sqlite3.Connection]:
+    """Open the cache database on first use; None when it is turned off or cannot be created"""
+    global _conn, _disabled
+    if _conn is None and not _disabled:
+        # Opt-in: responses carry users' health, medicine and finance details
+        if os.getenv("LIFEOPS_TASK_CACHE") != "1":
+            _disabled = True
+            return None
+        path = Path(os.getenv("LIFEOPS_TASK_CACHE_PATH", "~/.lifeops/task_cache.db")).expanduser()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(_SQL_CREATE)
+            conn.execute(_SQL_PURGE, (time.time(),))
+        except (OSError, sqlite3.Error) as e:
+            print(f"Task cache disabled: {e}")
+            _disabled = True
+            return None
+        _conn = conn
+    return _conn
+
+def make_key(*parts: str) -> str:
+    """Stable content hash for the given prompt parts"""
+    digest = xxhash.xxh3_128() if xxhash else hashlib.blake2b(digest_size=20)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+def get(key: str) -> Optional[str]:
+    """Cached value for key, or None when missing or expired"""
+    with _lock:
+        conn = _connection()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(_SQL_GET, (key, time.time())).fetchone()
+        except sqlite3.Error as e:
+            print(f"Task cache read error: {e}")
+            return None
+    return row[0] if row else None
+
+def put(key: str, value: str, ttl: float = CACHE_TTL) -> None:
+    """Store value under key for ttl seconds"""
+    with _lock:
+        conn = _connection()
+        if conn is None:
+            return
+        try:
+            conn.execute(_SQL_SET, (key, value, time.time() + ttl))
+        except sqlite3.Error as e:
+            print(f"Task cache write error: {e}")
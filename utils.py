@@ -3,16 +3,23 @@ LifeOps AI v2 - Enhanced Utility Functions with Professional UI Styles
 """
 import os
 import json
-from datetime import datetime, timedelta
-from typing import Dict, Any, List
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, Any, List, NamedTuple, Optional, Union
 import re
+from dotenv import load_dotenv
 
-def get_professional_styles() -> str:
-    """Return professional CSS styles for the Unstop-like UI"""
-    return """
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};:,>])\s*")
+
+def _minify_css(css: str) -> str:
+    """Drop comments and the whitespace the browser ignores"""
+    css = _CSS_SPACE_RE.sub(" ", _CSS_COMMENT_RE.sub("", css))
+    return _CSS_PUNCT_RE.sub(r"\1", css).strip()
+
+# Professional CSS styles for the Unstop-like UI, minified once at import
+_PROFESSIONAL_STYLES = _minify_css("""
     <style>
         /* Base Styles */
         .main {
@@ -341,16 +348,20 @@ def get_professional_styles() -> str:
             background: #95a5a6;
         }
     </style>
-    """
+    """)
+
+def get_professional_styles() -> str:
+    """Return professional CSS styles for the Unstop-like UI"""
+    return _PROFESSIONAL_STYLES
 
 # The rest of your existing utility functions remain the same...
 # [Keep all your existing functions: load_env, format_date, calculate_days_until, 
 # create_health_chart, create_finance_chart, create_study_schedule,
 # create_insight_card, parse_agent_output, extract_action_items, create_weekly_summary]
 
+@lru_cache(maxsize=1)
 def load_env():
-    """Load environment variables"""
-    from dotenv import load_dotenv
+    """Load environment variables (once; a missing key is re-checked on the next call)"""
     load_dotenv()
     
     api_key = os.getenv("GOOGLE_API_KEY")
@@ -358,25 +369,63 @@ def load_env():
         raise ValueError("GOOGLE_API_KEY not found in environment variables")
     return api_key
 
+@lru_cache(maxsize=512)
+def _parse_date(date_str: str) -> Optional[date]:
+    """Parse a YYYY-MM-DD string once, returning None when it is not a date"""
+    try:
+        return date.fromisoformat(date_str)
+    except (TypeError, ValueError):
+        return None
+
+@lru_cache(maxsize=512)
 def format_date(date_str: str) -> str:
     """Format date for display"""
-    try:
-        date = datetime.strptime(date_str, "%Y-%m-%d")
-        return date.strftime("%B %d, %Y")
-    except:
-        return date_str
+    parsed = _parse_date(date_str)
+    return parsed.strftime("%B %d, %Y") if parsed else date_str
 
 def calculate_days_until(target_date: str) -> int:
     """Calculate days until a target date"""
-    try:
-        target = datetime.strptime(target_date, "%Y-%m-%d")
-        today = datetime.now()
-        return (target - today).days
-    except:
+    target = _parse_date(target_date)
+    if target is None:
         return 0
+    return (target - date.today()).days
+
+# Plotly (and pandas/NumPy for the study schedule) are imported by the chart
+# builders on first use, so pages that never draw a chart skip their import cost.
+@lru_cache(maxsize=1)
+def _chart_template() -> str:
+    """Register the shared chart layout once and return the template name to use"""
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    
+    pio.templates["lifeops"] = go.layout.Template(layout=dict(
+        height=300,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font={'color': '#2c3e50'}
+    ))
+    return "plotly+lifeops"
+
+_STRESS_STEPS = (
+    {'range': [0, 3], 'color': "#2ecc71"},
+    {'range': [3, 7], 'color': "#f39c12"},
+    {'range': [7, 10], 'color': "#e74c3c"}
+)
+_FINANCE_LABELS = ('Budget', 'Expenses', 'Savings')
+_FINANCE_COLORS = ('#3498db', '#e74c3c', '#2ecc71')
 
 def create_health_chart(stress_level: int, hours_sleep: int = 7, exercise_minutes: int = 30):
     """Create a health dashboard chart v2"""
+    import plotly.graph_objects as go
+    
+    # A fresh figure per call, so one caller's changes never reach another's chart
+    return go.Figure(_health_chart_spec(stress_level, hours_sleep, exercise_minutes))
+
+@lru_cache(maxsize=32)
+def _health_chart_spec(stress_level: int, hours_sleep: int, exercise_minutes: int) -> Dict[str, Any]:
+    """Build the health chart once per argument tuple, as a plain figure dict"""
+    import plotly.graph_objects as go
+    
     fig = go.Figure()
     
     # Stress level gauge
@@ -388,66 +437,79 @@ def create_health_chart(stress_level: int, hours_sleep: int = 7, exercise_minute
         gauge={
             'axis': {'range': [None, 10]},
             'bar': {'color': "#3498db"},
-            'steps': [
-                {'range': [0, 3], 'color': "#2ecc71"},
-                {'range': [3, 7], 'color': "#f39c12"},
-                {'range': [7, 10], 'color': "#e74c3c"}
-            ]
+            'steps': _STRESS_STEPS
         }
     ))
     
     fig.update_layout(
         grid={'rows': 1, 'columns': 1, 'pattern': "independent"},
-        height=300,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font={'color': '#2c3e50'}
+        template=_chart_template()
     )
     
-    return fig
+    return fig.to_dict()
 
 def create_finance_chart(budget: float, expenses: float = 0):
     """Create a finance chart v2"""
+    import plotly.graph_objects as go
+    
+    return go.Figure(_finance_chart_spec(budget, expenses))
+
+@lru_cache(maxsize=32)
+def _finance_chart_spec(budget: float, expenses: float) -> Dict[str, Any]:
+    """Build the finance chart once per argument tuple, as a plain figure dict"""
+    import plotly.graph_objects as go
+    
+    if budget <= 0:
+        fig = go.Figure()
+        fig.add_annotation(text="No budget set", showarrow=False)
+        fig.update_layout(
+            title="Budget Allocation",
+            xaxis_visible=False,
+            yaxis_visible=False,
+            template=_chart_template()
+        )
+        return fig.to_dict()
+    
+    expenses = max(expenses, 0)
     savings = budget - expenses if budget > expenses else 0
-    labels = ['Budget', 'Expenses', 'Savings']
     values = [budget, expenses, savings]
     
     fig = go.Figure(data=[go.Pie(
-        labels=labels,
+        labels=_FINANCE_LABELS,
         values=values,
         hole=.3,
-        marker_colors=['#3498db', '#e74c3c', '#2ecc71']
+        marker_colors=_FINANCE_COLORS
     )])
     
     fig.update_layout(
         title="Budget Allocation",
-        height=300,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font={'color': '#2c3e50'}
+        template=_chart_template()
     )
     
-    return fig
+    return fig.to_dict()
 
 def create_study_schedule(days_until_exam: int, study_hours_per_day: int):
     """Create a study schedule timeline v2"""
+    import plotly.graph_objects as go
+    
+    return go.Figure(_study_schedule_spec(days_until_exam, study_hours_per_day, date.today()))
+
+@lru_cache(maxsize=32)
+def _study_schedule_spec(days_until_exam: int, study_hours_per_day: int, start: date) -> Dict[str, Any]:
+    """Build the study schedule starting from the given day, as a plain figure dict"""
+    import numpy as np
+    import pandas as pd
+    import plotly.graph_objects as go
+    
     if days_until_exam <= 0:
         days_until_exam = 7  # Default to one week
         
-    dates = []
-    hours = []
+    dates = pd.date_range(start, periods=days_until_exam).strftime("%b %d")
     
-    for i in range(days_until_exam):
-        date = datetime.now() + timedelta(days=i)
-        dates.append(date.strftime("%b %d"))
-        
-        # Taper study hours as exam approaches
-        if i < days_until_exam - 3:
-            hours.append(study_hours_per_day)
-        elif i == days_until_exam - 1:
-            hours.append(2)  # Light review on last day
-        else:
-            hours.append(study_hours_per_day * 0.7)
+    # Taper study hours as exam approaches, with light review on the last day
+    day = np.arange(days_until_exam)
+    hours = np.where(day < days_until_exam - 3, study_hours_per_day,
+                     np.where(day == days_until_exam - 1, 2, study_hours_per_day * 0.7))
     
     fig = go.Figure(data=[go.Bar(
         x=dates,
@@ -461,30 +523,23 @@ def create_study_schedule(days_until_exam: int, study_hours_per_day: int):
         title="Recommended Study Schedule",
         xaxis_title="Date",
         yaxis_title="Study Hours",
-        height=300,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font={'color': '#2c3e50'}
+        template=_chart_template()
     )
     
-    return fig
+    return fig.to_dict()
 
-def create_insight_card(title: str, content: str, agent: str, color: str = "#3498db"):
-    """Create a formatted insight card v2"""
-    agent_colors = {
-        "Health": "#2ecc71",
-        "Finance": "#f39c12",
-        "Study": "#3498db",
-        "Coordinator": "#9b59b6",
-        "Reflection": "#95a5a6"
-    }
-    
-    card_color = agent_colors.get(agent, color)
-    
-    card = f"""
+_AGENT_COLORS = {
+    "Health": "#2ecc71",
+    "Finance": "#f39c12",
+    "Study": "#3498db",
+    "Coordinator": "#9b59b6",
+    "Reflection": "#95a5a6"
+}
+
+_CARD_TEMPLATE = """
     <div style="
-        background: linear-gradient(135deg, {card_color}20, {card_color}10);
-        border-left: 4px solid {card_color};
+        background: linear-gradient(135deg, {c}20, {c}10);
+        border-left: 4px solid {c};
         padding: 24px;
         border-radius: 12px;
         margin: 16px 0;
@@ -494,11 +549,11 @@ def create_insight_card(title: str, content: str, agent: str, color: str = "#349
             <div style="
                 width: 12px;
                 height: 12px;
-                background-color: {card_color};
+                background-color: {c};
                 border-radius: 50%;
                 margin-right: 12px;
             "></div>
-            <h4 style="margin: 0; color: {card_color}; font-weight: 600; font-size: 18px;">{title}</h4>
+            <h4 style="margin: 0; color: {c}; font-weight: 600; font-size: 18px;">{title}</h4>
         </div>
         <p style="margin: 0; color: #2c3e50; line-height: 1.6; font-size: 14px;">{content}</p>
         <div style="
@@ -512,78 +567,103 @@ def create_insight_card(title: str, content: str, agent: str, color: str = "#349
         </div>
     </div>
     """
-    
-    return card
+
+def create_insight_card(title: str, content: str, agent: str, color: str = "#3498db"):
+    """Create a formatted insight card v2"""
+    card_color = _AGENT_COLORS.get(agent, color)
+    return _CARD_TEMPLATE.format(c=card_color, title=title, content=content, agent=agent)
+
+# A ```json block wins over any other fenced block; without one, the first
+# fenced block is tried whatever its language tag
+_JSON_FENCED_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+_FENCED_RE = re.compile(r'```\s*(.*?)\s*```', re.DOTALL)
 
 def parse_agent_output(output: str) -> Dict[str, Any]:
     """Parse agent output into structured data v2"""
+    fenced = _JSON_FENCED_RE.search(output) or _FENCED_RE.search(output)
+    if fenced:
+        json_str = fenced.group(1)
+    else:
+        # Look for JSON-like structure
+        start_idx = output.find("{")
+        end_idx = output.rfind("}")
+        if start_idx == -1 or end_idx == -1:
+            return {"raw_output": output}
+        json_str = output[start_idx:end_idx+1]
+    
     try:
-        # Try to extract JSON-like content
-        if "```json" in output:
-            json_str = output.split("```json")[1].split("```")[0].strip()
-        elif "```" in output:
-            json_str = output.split("```")[1].strip()
-            if json_str.startswith("json"):
-                json_str = json_str[4:].strip()
-        else:
-            # Look for JSON-like structure
-            start_idx = output.find("{")
-            end_idx = output.rfind("}")
-            if start_idx != -1 and end_idx != -1:
-                json_str = output[start_idx:end_idx+1]
-            else:
-                return {"raw_output": output}
-        
         return json.loads(json_str)
-    except:
+    except ValueError:
         return {"raw_output": output}
 
+# Section order used by LifeOpsCrew's batched domain prompt
+_BATCH_SECTIONS = {'1': 'health', '2': 'finance', '3': 'study'}
+
+def parse_batched_output(text: str) -> Dict[str, str]:
+    """Split a batched domain response on its ===SECTION k=== delimiters"""
+    parts = re.split(r'===\s*SECTION\s*(\d+)\s*===', text)
+    sections = {}
+    # re.split keeps the captured numbers: [preamble, '1', body, '2', body, ...]
+    for index, body in zip(parts[1::2], parts[2::2]):
+        key = _BATCH_SECTIONS.get(index)
+        if key and body.strip():
+            sections[key] = body.strip()
+    return sections
+
+# Bullets, numbered items, dashes and Action:/Task:/Do: prefixes at the start
+# of a line, captured up to the first period within 200 characters
+_ACTION_RE = re.compile(r'(?m)^[ \t]*(?:•|\d+\.|-|Action:|Task:|Do:)[ \t]*([^\n]{10,200}?\.)')
+_ACTION_SCAN_LIMIT = 100_000  # characters of agent output scanned for actions
+
 def extract_action_items(text: str) -> List[str]:
     """Extract potential action items from text"""
-    # Regex patterns for action items
-    patterns = [
-        r"•\s*(.*?\.)",  # Bullet points
-        r"\d+\.\s*(.*?\.)",  # Numbered lists
-        r"-?\s*(.*?\.)",  # Dash lists
-        r"Action:\s*(.*?\.)",  # Action: format
-        r"Task:\s*(.*?\.)",  # Task: format
-        r"Do:\s*(.*?\.)",  # Do: format
-    ]
-    
-    actions = []
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        actions.extend(matches)
-    
-    # Filter and clean
-    cleaned = []
-    for action in actions:
-        action = action.strip()
-        if len(action) > 10 and not action.startswith("http"):  # Meaningful length, not URLs
-            cleaned.append(action[:200])  # Limit length
-    
-    return cleaned[:10]  # Return top 10
+    if not text:
+        return []
+    actions = {}  # insertion-ordered set
+    for match in _ACTION_RE.finditer(text, 0, _ACTION_SCAN_LIMIT):
+        if (action := match.group(1).strip()).startswith("http"):  # Not URLs
+            continue
+        actions[action] = None
+        if len(actions) == 10:  # Top 10
+            break
+    return list(actions)
 
-def create_weekly_summary(data: Dict[str, Any]) -> str:
-    """Create a weekly summary from data"""
-    summary = f"""
-    ## Weekly Summary - {datetime.now().strftime('%B %d, %Y')}
+class WeeklyMetrics(NamedTuple):
+    """Metrics shown in the weekly summary"""
+    completed: int = 0
+    total: int = 0
+    study_hours: float = 0
+    exercise: int = 0
+    sleep_avg: float = 0
+    spent: float = 0
+    savings: float = 0
+    bills_paid: int = 0
+    stress_avg: float = 0
+    energy_avg: float = 0
+    focus_avg: float = 0
+
+_SUMMARY_TEMPLATE = """
+    ## Weekly Summary - {date}
     
     **Performance Metrics:**
-    - Actions Completed: {data.get('completed', 0)}/{data.get('total', 0)}
-    - Study Hours: {data.get('study_hours', 0)}
-    - Exercise Sessions: {data.get('exercise', 0)}
-    - Average Sleep: {data.get('sleep_avg', 0):.1f} hours
+    - Actions Completed: {m.completed}/{m.total}
+    - Study Hours: {m.study_hours}
+    - Exercise Sessions: {m.exercise}
+    - Average Sleep: {m.sleep_avg:.1f} hours
     
     **Financial Summary:**
-    - Budget Spent: ${data.get('spent', 0):.2f}
-    - Savings: ${data.get('savings', 0):.2f}
-    - Bills Paid: {data.get('bills_paid', 0)}
+    - Budget Spent: ${m.spent:.2f}
+    - Savings: ${m.savings:.2f}
+    - Bills Paid: {m.bills_paid}
     
     **Health Indicators:**
-    - Average Stress: {data.get('stress_avg', 0)}/10
-    - Energy Level: {data.get('energy_avg', 0)}/10
-    - Focus Score: {data.get('focus_avg', 0)}/10
+    - Average Stress: {m.stress_avg}/10
+    - Energy Level: {m.energy_avg}/10
+    - Focus Score: {m.focus_avg}/10
     """
-    
-    return summary
+
+def create_weekly_summary(data: Union[WeeklyMetrics, Dict[str, Any]]) -> str:
+    """Create a weekly summary from metrics (a plain dict is still accepted)"""
+    if not isinstance(data, WeeklyMetrics):
+        data = WeeklyMetrics(**{k: data[k] for k in WeeklyMetrics._fields if k in data})
+    return _SUMMARY_TEMPLATE.format(m=data, date=datetime.now().strftime('%B %d, %Y'))